@@ -7,10 +7,9 @@ import sys
 import re
 import time
 import wave
-import pyaudio
 from datetime import datetime
 from docx import Document
-from RealtimeSTT import AudioToTextRecorder
+from report_export import REPORT_HEADINGS, ReportExporter, read_report_sections
 
 class GynecologyReportUI:
     def __init__(self, root):
@@ -26,25 +25,7 @@ class GynecologyReportUI:
         self.doc_path = os.path.join(self.save_path, "First_Trimester_Report.docx")
         
         # First Trimester Gynecology Report headings
-        self.headings = [
-            "Patient Information:",
-            "LMP",
-            "Gestational Age:",
-            "Type of Scan:",
-            "Uterine Position:",
-            "Endometrial Thickness:",
-            "Fetal Pole:",
-            "Crown Rump Length",
-            "Fetal Heart Rate:",
-            "Amniotic Fluid:",
-            "Placental Position:",
-            "Adnexal Region:",
-            "Cervical Length:",
-            "Nuchal Translucency",
-            "Additional Findings:",
-            "Impression:",
-            "Recommendations:"
-        ]
+        self.headings = list(REPORT_HEADINGS)
         
         # Speech recognition variables
         self.current_heading = None
@@ -77,6 +58,12 @@ class GynecologyReportUI:
         self.frames = []
         self.is_audio_recording = False
         
+        # Guards the report file so Finalize never reads it mid-save
+        self.doc_lock = threading.Lock()
+        
+        # Background export of finalized reports (JSON, text summary, PDF)
+        self.exporter = ReportExporter(max_workers=2)
+        
         # Create UI elements
         self.create_menu()
         self.create_ui()
@@ -95,6 +82,7 @@ class GynecologyReportUI:
         file_menu = tk.Menu(menubar, tearoff=0)
         file_menu.add_command(label="New Report", command=self.new_report)
         file_menu.add_command(label="Open Report", command=self.open_report)
+        file_menu.add_command(label="Finalize and Export Report", command=self.finalize_report)
         file_menu.add_command(label="Change Save Location", command=self.change_save_location)
         file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.exit_app)
@@ -126,6 +114,7 @@ class GynecologyReportUI:
         # Recording control buttons
         self.record_button = ttk.Button(top_frame, text="Start Recording", command=self.toggle_recording)
         self.record_button.pack(side=tk.RIGHT, padx=5)
+        ttk.Button(top_frame, text="Finalize Report", command=self.finalize_report).pack(side=tk.RIGHT, padx=5)
         
         # Middle section - Split view
         middle_frame = ttk.Frame(main_frame)
@@ -227,7 +216,8 @@ class GynecologyReportUI:
                         break
                         
             if found:
-                doc.save(self.doc_path)
+                with self.doc_lock:
+                    doc.save(self.doc_path)
                 self.log(f"Updated: {heading} -> {text}")
                 
                 # Update the content text widget to show the current value
@@ -431,6 +421,45 @@ class GynecologyReportUI:
             self.log(f"Error updating physician name: {e}")
             messagebox.showerror("Error", f"Error updating physician name: {e}")
 
+    def finalize_report(self):
+        # Snapshot the section values and hand them to the export pool - never blocks dictation
+        try:
+            # Transcription may be saving the document right now
+            with self.doc_lock:
+                report = read_report_sections(self.doc_path, self.headings)
+        except Exception as e:
+            self.log(f"Error reading report for export: {e}")
+            messagebox.showerror("Error", f"Error reading report for export: {e}")
+            return
+        
+        if not report['sections']:
+            self.log("Warning: no report sections found - export will be empty")
+        
+        report['finalized_at'] = datetime.now().isoformat(timespec='seconds')
+        export_dir = os.path.join(self.save_path, "exports")
+        try:
+            future = self.exporter.submit(report, export_dir)
+        except RuntimeError as e:  # includes BrokenProcessPool
+            self.log(f"Error starting report export: {e}")
+            messagebox.showerror("Error", f"Error starting report export: {e}")
+            return
+        
+        self.root.after(200, self.poll_export, future)
+        self.log(f"Report finalized, exporting to {export_dir}...")
+        self.status_var.set("Report finalized - exporting in background")
+
+    def poll_export(self, future):
+        # Checked from the Tk event loop - the pool's own threads must never touch widgets
+        if not future.done():
+            self.root.after(200, self.poll_export, future)
+            return
+        
+        try:
+            for path in future.result():
+                self.log(f"Exported: {path}")
+        except Exception as e:
+            self.log(f"Error exporting report: {e}")
+
     def toggle_recording(self):
         if not self.is_recording:
             self.start_recording()
@@ -443,6 +472,11 @@ class GynecologyReportUI:
         self.record_button.config(text="Stop Recording")
         self.status_var.set("Recording... Speak clearly")
         
+        # Imported here so spawned export workers, which re-run this module's
+        # top level, don't load torch/faster-whisper and PortAudio
+        import pyaudio
+        from RealtimeSTT import AudioToTextRecorder
+        
         # Configure STT recorder
         recorder_config = {
             'spinner': False,
@@ -487,6 +521,7 @@ class GynecologyReportUI:
 
     def record_audio(self):
         # Function to record audio to a wav file
+        import pyaudio
         file_name = os.path.join(self.save_path, "recorded_audio.wav")
         self.audio = pyaudio.PyAudio()
         self.stream = self.audio.open(format=pyaudio.paInt16, channels=1, rate=44100, input=True, frames_per_buffer=1024)
@@ -629,6 +664,8 @@ Tips:
 - Update physician name before starting
 - Speak clearly and pause between phrases
 - Text will be automatically added to the current section
+- Click "Finalize Report" to export JSON, text and PDF copies
+  to the "exports" folder in the background
 """
         messagebox.showinfo("Instructions", instructions)
 
@@ -648,6 +685,8 @@ trimester gynecology reports with automatic transcription.
         if messagebox.askyesno("Exit", "Are you sure you want to exit?"):
             if self.is_recording:
                 self.stop_recording()
+            # Let pending exports finish writing before exiting
+            self.exporter.shutdown(wait=True)
             self.root.destroy()
             sys.exit(0)
 
@@ -0,0 +1,335 @@
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import multiprocessing
+from datetime import datetime
+from xml.sax.saxutils import escape
+from concurrent.futures import ProcessPoolExecutor, as_completed, wait
+from concurrent.futures.process import BrokenProcessPool
+from docx import Document
+
+# PDF export is optional - only available when reportlab is installed
+try:
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+except ImportError:
+    SimpleDocTemplate = None
+
+REPORT_TITLE = "First Trimester Ultrasound Report"
+# Same format init_document writes for the "Report Date:" line
+REPORT_DATE_FORMAT = "%B %d, %Y at %I:%M %p"
+EXPORT_FORMATS = ("json", "txt", "pdf")
+
+# First Trimester Gynecology Report headings
+REPORT_HEADINGS = [
+    "Patient Information:",
+    "LMP",
+    "Gestational Age:",
+    "Type of Scan:",
+    "Uterine Position:",
+    "Endometrial Thickness:",
+    "Fetal Pole:",
+    "Crown Rump Length",
+    "Fetal Heart Rate:",
+    "Amniotic Fluid:",
+    "Placental Position:",
+    "Adnexal Region:",
+    "Cervical Length:",
+    "Nuchal Translucency",
+    "Additional Findings:",
+    "Impression:",
+    "Recommendations:"
+]
+
+
+def clean_heading(heading):
+    # "Gestational Age:" -> "Gestational Age"
+    return heading.strip().rstrip(":").strip()
+
+
+def normalize_text(text):
+    # Same normalization the report UI uses to match headings
+    return re.sub(r'[^\w\s]', '', text).strip().lower()
+
+
+def read_report_sections(doc_path, headings=REPORT_HEADINGS):
+    # Read physician, report date and section values from an existing report document
+    doc = Document(doc_path)
+    paragraphs = doc.paragraphs
+    known_headings = {normalize_text(heading) for heading in headings}
+    physician = ""
+    report_date = ""
+    sections = {}
+
+    for i, para in enumerate(paragraphs):
+        if para.text.startswith("Physician:"):
+            physician = para.text[len("Physician:"):].strip()
+        elif para.text.startswith("Report Date:"):
+            report_date = para.text[len("Report Date:"):].strip()
+        # Older documents have plain-text headings, so fall back to the heading list
+        elif para.style.name == 'Heading 2' or normalize_text(para.text) in known_headings:
+            value = paragraphs[i + 1].text if i + 1 < len(paragraphs) else ""
+            sections[para.text] = value
+
+    if not sections:
+        print(f"Warning: no report sections found in {doc_path}")
+
+    return {
+        'source': os.path.abspath(doc_path),
+        'physician': physician,
+        'report_date': report_date,
+        'sections': sections,
+    }
+
+
+def is_placeholder_physician(physician):
+    # init_document writes "Dr. _________________" until the physician is updated
+    return not physician.replace("Dr.", "").strip(" _")
+
+
+def physician_display(report):
+    # The physician's name, or "-" while the document still has the placeholder
+    return "-" if is_placeholder_physician(report['physician']) else report['physician']
+
+
+def parse_report_date(report_date):
+    # "October 19, 2026 at 10:00 AM" -> "2026-10-19T10:00:00", None if unparseable
+    try:
+        return datetime.strptime(report_date, REPORT_DATE_FORMAT).isoformat()
+    except ValueError:
+        return None
+
+
+def build_fhir_record(report):
+    # FHIR-style DiagnosticReport with one contained Observation per filled-in section
+    observations = []
+    results = []
+    for index, (heading, value) in enumerate(report['sections'].items(), start=1):
+        value = value.strip()
+        if not value:
+            continue  # FHIR does not allow empty strings
+        obs_id = f"section-{index}"
+        observations.append({
+            'resourceType': "Observation",
+            'id': obs_id,
+            'status': "final",
+            'code': {'text': clean_heading(heading)},
+            'valueString': value,
+        })
+        results.append({'reference': f"#{obs_id}"})
+
+    sections = {clean_heading(h): v.strip() for h, v in report['sections'].items()}
+    record = {
+        'resourceType': "DiagnosticReport",
+        'status': "final",
+        'code': {'text': REPORT_TITLE},
+        'issued': report.get('finalized_at') or datetime.now().isoformat(timespec='seconds'),
+    }
+    if not is_placeholder_physician(report['physician']):
+        record['performer'] = [{'display': report['physician']}]
+    if observations:
+        record['contained'] = observations
+        record['result'] = results
+    if sections.get("Impression"):
+        record['conclusion'] = sections["Impression"]
+
+    # FHIR dateTime must be ISO-8601 - leave it out rather than pass free text through
+    effective = parse_report_date(report['report_date'])
+    if effective:
+        record['effectiveDateTime'] = effective
+
+    return record
+
+
+def build_text_summary(report):
+    lines = [
+        REPORT_TITLE,
+        f"Report Date: {report['report_date']}",
+        f"Physician: {physician_display(report)}",
+        "--------------------------------------------------",
+    ]
+    for heading, value in report['sections'].items():
+        lines.append(f"{clean_heading(heading)}: {value.strip() or '-'}")
+    return "\n".join(lines) + "\n"
+
+
+def write_pdf(report, pdf_path):
+    # Render the PDF from the section values rather than converting the DOCX
+    styles = getSampleStyleSheet()
+    story = [
+        Paragraph(escape(REPORT_TITLE), styles['Heading1']),
+        Paragraph(escape(f"Report Date: {report['report_date']}"), styles['Normal']),
+        Paragraph(escape(f"Physician: {physician_display(report)}"), styles['Normal']),
+        Spacer(1, 12),
+    ]
+    for heading, value in report['sections'].items():
+        story.append(Paragraph(escape(heading), styles['Heading2']))
+        story.append(Paragraph(escape(value) or "-", styles['Normal']))
+    SimpleDocTemplate(pdf_path, pagesize=A4, title=REPORT_TITLE).build(story)
+
+
+def output_formats(formats):
+    # The formats that will actually be written - PDF needs reportlab
+    return [fmt for fmt in formats if fmt != "pdf" or SimpleDocTemplate is not None]
+
+
+def reserve_base_path(output_dir, base_name, formats):
+    # Pick a base path no other export uses - "_2", "_3", ... if the name is taken.
+    # The first file is created exclusively so concurrent workers can't claim the same name.
+    extensions = output_formats(formats)
+    suffix = 1
+    while True:
+        base_path = os.path.join(output_dir, base_name if suffix == 1 else f"{base_name}_{suffix}")
+        if not any(os.path.exists(f"{base_path}.{ext}") for ext in extensions[1:]):
+            try:
+                if extensions:
+                    open(f"{base_path}.{extensions[0]}", 'x').close()
+                return base_path
+            except FileExistsError:
+                pass
+        suffix += 1
+
+
+def export_report(report, output_dir, formats=EXPORT_FORMATS):
+    # Worker entry point - runs in a separate process, returns the written file paths
+    os.makedirs(output_dir, exist_ok=True)
+    base_name = os.path.splitext(os.path.basename(report['source']))[0]
+    if report.get('finalized_at'):
+        base_name = f"{base_name}_{report['finalized_at'].replace(':', '').replace('-', '')}"
+    base_path = reserve_base_path(output_dir, base_name, formats)
+    written = []
+
+    try:
+        if "json" in formats:
+            with open(f"{base_path}.json", 'w', encoding='utf-8') as f:
+                json.dump(build_fhir_record(report), f, indent=2)
+            written.append(f"{base_path}.json")
+
+        if "txt" in formats:
+            with open(f"{base_path}.txt", 'w', encoding='utf-8') as f:
+                f.write(build_text_summary(report))
+            written.append(f"{base_path}.txt")
+
+        if "pdf" in formats and SimpleDocTemplate is not None:
+            write_pdf(report, f"{base_path}.pdf")
+            written.append(f"{base_path}.pdf")
+    except Exception:
+        # Don't leave the reserved name or a partial set of files behind
+        for fmt in output_formats(formats):
+            if os.path.exists(f"{base_path}.{fmt}"):
+                os.remove(f"{base_path}.{fmt}")
+        raise
+
+    return written
+
+
+def export_document(doc_path, output_dir, formats=EXPORT_FORMATS):
+    # Worker entry point for reports that only exist on disk
+    return export_report(read_report_sections(doc_path), output_dir, formats)
+
+
+def _warm_up():
+    # No-op task used to start the worker processes ahead of the first export
+    return None
+
+
+class ReportExporter:
+    """Runs report exports on a process pool so dictation is never blocked."""
+
+    def __init__(self, max_workers=None):
+        # Always spawn: forking the GUI process would copy its live audio and
+        # transcription threads and the loaded speech models into the workers
+        self.max_workers = max_workers or min(os.cpu_count() or 1, 61)
+        self.start()
+
+    def start(self):
+        self.executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                            mp_context=multiprocessing.get_context("spawn"))
+        # Spawned workers start on demand, so start them now rather than mid-session
+        self.warm_up_futures = [self.executor.submit(_warm_up) for _ in range(self.max_workers)]
+
+    def wait_ready(self):
+        # Block until every worker has started and imported its dependencies
+        wait(self.warm_up_futures)
+
+    def _submit(self, fn, *args):
+        try:
+            return self.executor.submit(fn, *args)
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory) - replace the pool instead of
+            # failing every export until the app restarts
+            self.executor.shutdown(wait=False)
+            self.start()
+            return self.executor.submit(fn, *args)
+
+    def submit(self, report, output_dir, formats=EXPORT_FORMATS):
+        return self._submit(export_report, report, output_dir, formats)
+
+    def submit_document(self, doc_path, output_dir, formats=EXPORT_FORMATS):
+        return self._submit(export_document, doc_path, output_dir, formats)
+
+    def shutdown(self, wait=True):
+        self.executor.shutdown(wait=wait)
+
+
+def benchmark(report_dir, output_dir, workers=None, formats=EXPORT_FORMATS):
+    # Export every report in report_dir and measure throughput, returns the exit status
+    doc_paths = [os.path.join(report_dir, name) for name in sorted(os.listdir(report_dir))
+                 if name.lower().endswith(".docx")]
+    if not doc_paths:
+        print(f"No .docx reports found in {report_dir}")
+        return 1
+
+    if "pdf" in formats and SimpleDocTemplate is None:
+        print("reportlab not installed - PDF export will be skipped")
+
+    start = time.perf_counter()
+    exporter = ReportExporter(max_workers=workers)
+    exporter.wait_ready()
+    print(f"Started {exporter.max_workers} workers in {time.perf_counter() - start:.2f}s")
+
+    failures = 0
+    files_written = 0
+    start = time.perf_counter()
+    try:
+        futures = [exporter.submit_document(path, output_dir, formats) for path in doc_paths]
+        for future in as_completed(futures):
+            try:
+                files_written += len(future.result())
+            except Exception as e:
+                failures += 1
+                print(f"Export failed: {e}")
+    finally:
+        exporter.shutdown()
+    elapsed = time.perf_counter() - start
+
+    exported = len(doc_paths) - failures
+    print(f"Exported {exported}/{len(doc_paths)} reports ({files_written} files) in {elapsed:.2f}s")
+    print(f"Throughput: {exported / elapsed:.1f} reports/s")
+    return 1 if failures else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export existing report documents and measure throughput.")
+    parser.add_argument("report_dir", help="directory containing .docx reports")
+    parser.add_argument("-o", "--output-dir", help="export directory (default: <report_dir>/exports)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument("-f", "--formats", default=",".join(EXPORT_FORMATS),
+                        help="comma separated export formats (json,txt,pdf)")
+    args = parser.parse_args()
+
+    formats = tuple(fmt.strip() for fmt in args.formats.split(",") if fmt.strip())
+    unknown = [fmt for fmt in formats if fmt not in EXPORT_FORMATS]
+    if unknown:
+        parser.error(f"unknown export format(s): {', '.join(unknown)}")
+
+    output_dir = args.output_dir or os.path.join(args.report_dir, "exports")
+    return benchmark(args.report_dir, output_dir, args.workers, formats)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
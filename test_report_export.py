@@ -0,0 +1,115 @@
+import json
+import os
+
+import pytest
+
+pytest.importorskip("docx")
+
+from docx import Document
+
+import report_export
+
+
+def make_report(**overrides):
+    report = {
+        'source': "/reports/First_Trimester_Report.docx",
+        'physician': "Dr. Smith",
+        'report_date': "October 19, 2026 at 10:00 AM",
+        'sections': {
+            "LMP": "September 1, 2026",
+            "Fetal Heart Rate:": "",
+            "Impression:": "Single live intrauterine pregnancy",
+        },
+    }
+    report.update(overrides)
+    return report
+
+
+@pytest.mark.parametrize("physician, expected", [
+    ("Dr. _________________", True),
+    ("", True),
+    ("Dr. Smith", False),
+])
+def test_is_placeholder_physician(physician, expected):
+    assert report_export.is_placeholder_physician(physician) is expected
+
+
+def test_parse_report_date():
+    assert report_export.parse_report_date("October 19, 2026 at 10:00 AM") == "2026-10-19T10:00:00"
+    assert report_export.parse_report_date("next Tuesday") is None
+
+
+def test_fhir_record_skips_empty_sections():
+    record = report_export.build_fhir_record(make_report())
+
+    assert [obs['code']['text'] for obs in record['contained']] == ["LMP", "Impression"]
+    assert all(obs['valueString'] for obs in record['contained'])
+    assert [ref['reference'] for ref in record['result']] == ["#section-1", "#section-3"]
+    assert record['conclusion'] == "Single live intrauterine pregnancy"
+    assert record['effectiveDateTime'] == "2026-10-19T10:00:00"
+    assert record['performer'] == [{'display': "Dr. Smith"}]
+
+
+def test_fhir_record_omits_placeholders_and_unparseable_date():
+    report = make_report(physician="Dr. _________________", report_date="sometime",
+                         sections={"LMP": "", "Impression:": ""})
+    record = report_export.build_fhir_record(report)
+
+    for key in ('performer', 'effectiveDateTime', 'contained', 'result', 'conclusion'):
+        assert key not in record
+
+
+def test_text_summary_hides_placeholder_physician():
+    summary = report_export.build_text_summary(make_report(physician="Dr. _________________"))
+
+    assert "Physician: -\n" in summary
+    assert "Fetal Heart Rate: -\n" in summary
+    assert "_____" not in summary
+
+
+def test_reserve_base_path_adds_suffix_on_collision(tmp_path):
+    first = report_export.reserve_base_path(str(tmp_path), "report", ("json", "txt"))
+    second = report_export.reserve_base_path(str(tmp_path), "report", ("json", "txt"))
+
+    assert first == os.path.join(tmp_path, "report")
+    assert second == os.path.join(tmp_path, "report_2")
+
+    # A leftover file of a later format also marks the name as taken
+    (tmp_path / "other.txt").write_text("")
+    third = report_export.reserve_base_path(str(tmp_path), "other", ("json", "txt"))
+    assert third == os.path.join(tmp_path, "other_2")
+
+
+def test_export_report_writes_json_and_text(tmp_path):
+    written = report_export.export_report(make_report(finalized_at="2026-10-19T10:05:00"),
+                                          str(tmp_path), ("json", "txt"))
+
+    base = os.path.join(tmp_path, "First_Trimester_Report_20261019T100500")
+    assert written == [f"{base}.json", f"{base}.txt"]
+    with open(f"{base}.json", encoding='utf-8') as f:
+        assert json.load(f)['resourceType'] == "DiagnosticReport"
+
+
+def test_export_report_cleans_up_on_failure(tmp_path):
+    report = make_report(sections={"LMP": object()})
+
+    with pytest.raises(Exception):
+        report_export.export_report(report, str(tmp_path), ("txt", "json"))
+    assert os.listdir(tmp_path) == []
+
+
+def test_read_report_sections_falls_back_to_heading_text(tmp_path):
+    doc = Document()
+    doc.add_paragraph("Report Date: October 19, 2026 at 10:00 AM")
+    doc.add_paragraph("Physician: Dr. Smith")
+    doc.add_paragraph("LMP")
+    doc.add_paragraph("September 1, 2026")
+    doc.add_paragraph("Impression:")
+    doc.add_paragraph("Normal")
+    doc_path = tmp_path / "legacy.docx"
+    doc.save(str(doc_path))
+
+    report = report_export.read_report_sections(str(doc_path))
+
+    assert report['physician'] == "Dr. Smith"
+    assert report['sections'] == {"LMP": "September 1, 2026", "Impression:": "Normal"}